@@ -1,19 +1,22 @@
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Iterator
 import click
 from pathlib import Path
 import logging
+import os
 from datetime import datetime
-import time
+import signal
+import threading
 import logging.handlers
 import sys
 import platform
+from functools import cached_property
 from importlib.metadata import version
 
 from fileseek.core.archivist import Archivist
 from fileseek.core.config import ConfigManager
 from fileseek.cli.ui_helpers import UIHelpers
 from fileseek.cli.ascii_art import ASCIIArt
-from fileseek.pipeline.file_detector import FileDetector
+from fileseek.pipeline.file_detector import FileDetector, PathPatternMatcher
 from fileseek.watchers.watchers import WatchManager, FileWatcher, WatcherEvent
 from fileseek.core.system_deps import DependencyChecker
 
@@ -30,25 +33,53 @@ class FileSeekCLI:
         self.ui = UIHelpers()
         self.ascii = ASCIIArt()
         self.config = ConfigManager()
-        self.archivist = None
+        self.config_path: Optional[str] = None
 
     def initialize(self, config_path: Optional[str] = None):
         """Initialize the system."""
+        # Display banner with version from package
+        self.ascii.get_banner(__version__)
+        
+        # Heavy components are created on first use, see archivist
+        self.config_path = config_path
+
+    @cached_property
+    def archivist(self) -> Archivist:
+        """Archivist instance, created on first access.
+        
+        Failures are raised rather than printed so that the calling
+        command's error handler reports them once.
+        """
         try:
-            # Display banner with version from package
-            self.ascii.get_banner(__version__)
-            
-            # Initialize archivist
-            self.archivist = Archivist(config_path)
-            self.ui.print_success("System initialized successfully")
-            
+            archivist = Archivist(self.config_path)
         except Exception as e:
-            self.ui.print_error(f"Initialization failed: {e}")
-            raise click.Abort()
+            raise RuntimeError(f"Initialization failed: {e}") from e
+        
+        self.ui.print_success("System initialized successfully")
+        return archivist
 
 # Create a UI helper instance
 ui = UIHelpers()
 
+def _scandir_recursive(path: Path, recursive: bool) -> Iterator[os.DirEntry]:
+    """Yield file entries under a directory using os.scandir."""
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    # Skip symlinks to avoid loops and duplicate entries
+                    if entry.is_symlink():
+                        continue
+                    if entry.is_file(follow_symlinks=False):
+                        yield entry
+                    elif recursive and entry.is_dir(follow_symlinks=False):
+                        yield from _scandir_recursive(Path(entry.path), recursive)
+                except (PermissionError, FileNotFoundError):
+                    # Entry vanished or became unreadable while scanning
+                    continue
+    except (PermissionError, FileNotFoundError) as e:
+        logging.warning(f"Skipping unreadable directory {path}: {e}")
+
 @click.group()
 @click.option('--config', '-c', type=click.Path(exists=True), help='Path to config file')
 @click.option('--verbose', '-v', is_flag=True, help='Enable verbose output')
@@ -78,33 +109,43 @@ def process(cli: FileSeekCLI, paths: List[str], recursive: bool, dry_run: bool):
     """Process documents and add them to the archive."""
     try:
         file_detector = FileDetector()
-        files_to_process = []
         
-        # Get all files in target directories
-        current_files = set()
+        # Walk target paths once, collecting files with their modification
+        # times and the paths to look up previously ingested files for.
+        # File arguments only ever affect their own entry
+        current_files: Dict[Path, int] = {}
+        base_paths = set()
+        file_args = set()
         for path in paths:
-            path = Path(path)
+            path = Path(path).absolute()
             if path.is_file():
-                if file_detector.should_process_file(path):
-                    current_files.add(path)
-                    files_to_process.append(path)
+                file_args.add(path)
+                st = path.stat()
+                if file_detector.should_process_file(path, st):
+                    current_files[path] = st.st_mtime_ns
             elif path.is_dir():
-                glob_pattern = "**/*" if recursive else "*"
-                for file_path in path.glob(glob_pattern):
-                    if file_path.is_file() and file_detector.should_process_file(file_path):
-                        current_files.add(file_path)
-                        files_to_process.append(file_path)
+                base_paths.add(path)
+                for entry in _scandir_recursive(path, recursive):
+                    file_path = Path(entry.path)
+                    try:
+                        # DirEntry caches its stat result
+                        st = entry.stat(follow_symlinks=False)
+                    except (PermissionError, FileNotFoundError):
+                        continue
+                    if file_detector.should_process_file(file_path, st):
+                        current_files[file_path] = st.st_mtime_ns
                         
-        # Get previously ingested files in these directories
-        previous_files = set()
-        for path in paths:
-            path = Path(path)
-            base_path = path if path.is_dir() else path.parent
-            docs = cli.archivist.get_documents_in_directory(base_path, recursive)
-            previous_files.update(Path(doc['path']) for doc in docs)
-        
-        # Find deleted files
-        deleted_files = previous_files - current_files
+        # Get previously ingested files in these directories with one query
+        docs = cli.archivist.get_documents_in_directories(base_paths, recursive)
+        docs.extend(cli.archivist.db_manager.get_documents_by_paths(str(p) for p in file_args).values())
+        previous_files = {Path(doc['path']): doc['mtime_ns'] for doc in docs}
+        
+        # Find new/modified and deleted files
+        files_to_process = [
+            file_path for file_path, mtime_ns in current_files.items()
+            if previous_files.get(file_path) != mtime_ns
+        ]
+        deleted_files = previous_files.keys() - current_files.keys()
         
         if not files_to_process and not deleted_files:
             cli.ui.print_warning("No changes detected")
@@ -136,9 +177,10 @@ def process(cli: FileSeekCLI, paths: List[str], recursive: bool, dry_run: bool):
         if files_to_process:
             with cli.ui.create_progress_bar() as progress:
                 task = progress.add_task("Processing files...", total=len(files_to_process))
-                for file in files_to_process:
-                    cli.archivist.ingest_file(file)
-                    progress.advance(task)
+                cli.archivist.ingest_files(
+                    files_to_process,
+                    on_complete=lambda file, success: progress.advance(task)
+                )
                     
     except Exception as e:
         cli.ui.print_error(f"Processing failed: {e}")
@@ -346,8 +388,7 @@ def validate(cli: FileSeekCLI, path: str, recursive: bool):
         if path.is_file():
             paths_to_validate.append(path)
         elif path.is_dir():
-            glob_pattern = "**/*" if recursive else "*"
-            paths_to_validate.extend([p for p in path.glob(glob_pattern) if p.is_file()])
+            paths_to_validate.extend(Path(entry.path) for entry in _scandir_recursive(path, recursive))
             
         if not paths_to_validate:
             cli.ui.print_warning("No files found to validate")
@@ -361,19 +402,26 @@ def validate(cli: FileSeekCLI, path: str, recursive: bool):
         
         # Check database records
         file_detector = FileDetector()
+        docs_by_path = cli.archivist.db_manager.get_documents_by_paths(
+            str(file_path) for file_path in paths_to_validate
+        )
+        chunk_counts = cli.archivist.db_manager.get_chunk_counts(
+            doc['id'] for doc in docs_by_path.values()
+        )
         cli.ui.print_info("\n=== Database Records ===")
         for file_path in paths_to_validate:
-            doc = cli.archivist.db_manager.get_document_by_path(str(file_path))
+            doc = docs_by_path.get(str(file_path))
             if doc and file_detector.should_process_file(file_path):
                 total_docs += 1
-                embeddings = cli.archivist.db_manager.get_document_embeddings(doc['id'])
-                total_chunks += len(embeddings)
+                chunk_count = chunk_counts.get(doc['id'], 0)
+                total_chunks += chunk_count
                 cli.ui.print_info(f"\nDocument: {file_path}")
                 cli.ui.print_info(f"  ID: {doc['id']}")
-                cli.ui.print_info(f"  Chunks: {len(embeddings)}")
-                if embeddings:
+                cli.ui.print_info(f"  Chunks: {chunk_count}")
+                first_chunk = cli.archivist.db_manager.get_first_chunk(doc['id']) if chunk_count else None
+                if first_chunk:
                     cli.ui.print_info("  Sample first chunk:")
-                    cli.ui.print_info(f"    Text: {embeddings[0]['chunk_text'][:100]}...")
+                    cli.ui.print_info(f"    Text: {first_chunk['chunk_text'][:100]}...")
             else:
                 cli.ui.print_warning(f"No record found: {file_path}")
                 
@@ -404,34 +452,18 @@ def validate(cli: FileSeekCLI, path: str, recursive: bool):
 @click.option('--sort', '-s', type=click.Choice(['date', 'name', 'chunks']), default='date', 
               help='Sort by date, name or chunk count')
 @click.option('--reverse', '-r', is_flag=True, help='Reverse sort order')
+@click.option('--limit', '-l', type=int, default=None, help='Maximum number of documents to show')
 @click.pass_obj
-def list(cli: FileSeekCLI, sort: str, reverse: bool):
+def list(cli: FileSeekCLI, sort: str, reverse: bool, limit: Optional[int]):
     """List all documents in the archive."""
     try:
-        # Get all documents
-        docs = cli.archivist.db_manager.get_all_documents()
+        # Get sorted documents with chunk counts
+        enhanced_docs = cli.archivist.db_manager.list_documents(sort, reverse, limit)
         
-        if not docs:
+        if not enhanced_docs:
             cli.ui.print_warning("No documents found in archive")
             return
             
-        # Enhance document info with chunk counts
-        enhanced_docs = []
-        for doc in docs:
-            chunks = cli.archivist.db_manager.get_document_embeddings(doc['id'])
-            enhanced_docs.append({
-                **doc,
-                'chunk_count': len(chunks)
-            })
-            
-        # Sort documents
-        if sort == 'date':
-            enhanced_docs.sort(key=lambda x: x['created_at'], reverse=not reverse)
-        elif sort == 'name':
-            enhanced_docs.sort(key=lambda x: Path(x['path']).name, reverse=reverse)
-        else:  # chunks
-            enhanced_docs.sort(key=lambda x: x['chunk_count'], reverse=not reverse)
-            
         # Display results
         headers = ["ID", "Document", "Created", "Chunks"]
         rows = []
@@ -451,9 +483,11 @@ def list(cli: FileSeekCLI, sort: str, reverse: bool):
             title="Archived Documents"
         )
         
-        # Show summary
-        cli.ui.print_info(f"\nTotal documents: {len(enhanced_docs)}")
-        total_chunks = sum(doc['chunk_count'] for doc in enhanced_docs)
+        # Show summary for the whole archive, not just the listed rows
+        total_documents, total_chunks = cli.archivist.db_manager.get_totals()
+        cli.ui.print_info(f"\nTotal documents: {total_documents}")
+        if len(enhanced_docs) < total_documents:
+            cli.ui.print_info(f"Showing: {len(enhanced_docs)}")
         cli.ui.print_info(f"Total chunks: {total_chunks}")
         
     except Exception as e:
@@ -472,7 +506,17 @@ def watch(cli: FileSeekCLI, paths: List[str], recursive: bool, patterns: List[st
             cli.ui.print_error("No paths specified")
             return
         
+        # Initialize the archivist up front so setup errors abort immediately
+        # instead of surfacing on every event in the watcher thread
+        cli.archivist
+        
+        stop_event = threading.Event()
         file_detector = FileDetector()
+        
+        # Get excluded patterns from config and compile them once rather than per event
+        excluded_patterns = cli.config.get('processing.excluded_patterns', [])
+        excluded_matcher = PathPatternMatcher(excluded_patterns)
+        
         def handle_event(event: WatcherEvent):
             """Handle file system events."""
             try:
@@ -481,7 +525,7 @@ def watch(cli: FileSeekCLI, paths: List[str], recursive: bool, patterns: List[st
                     if event.is_directory:
                         return
                     # Skip if file matches excluded patterns
-                    if any(event.path.match(pattern) for pattern in cli.config.get('processing.excluded_patterns', [])):
+                    if excluded_matcher.match(event.path):
                         return
                     
                     # Validate file using FileDetector
@@ -503,9 +547,6 @@ def watch(cli: FileSeekCLI, paths: List[str], recursive: bool, patterns: List[st
         # Create watch manager
         watch_manager = WatchManager()
         
-        # Get excluded patterns from config with correct path
-        excluded_patterns = cli.config.get('processing.excluded_patterns', [])
-        
         # Add watcher with paths and callback
         watch_manager.add_watcher(
             name='default',
@@ -516,15 +557,24 @@ def watch(cli: FileSeekCLI, paths: List[str], recursive: bool, patterns: List[st
             recursive=recursive
         )
         
-        # Start watching
+        # Start watching, blocking without periodic wakeups until Ctrl+C
+        previous_handler = signal.signal(signal.SIGINT, lambda *_: stop_event.set())
         try:
             watch_manager.start()
             cli.ui.print_info("Watching for changes (Press Ctrl+C to stop)...")
-            while True:
-                time.sleep(1)
+            if os.name == 'nt':
+                # Untimed waits can't be interrupted by Ctrl+C on Windows
+                while not stop_event.wait(1.0):
+                    pass
+            else:
+                stop_event.wait()
         except KeyboardInterrupt:
-            cli.ui.print_info("\nStopping file watcher...")
-            watch_manager.stop()
+            pass
+        finally:
+            signal.signal(signal.SIGINT, previous_handler)
+            
+        cli.ui.print_info("\nStopping file watcher...")
+        watch_manager.stop()
             
     except Exception as e:
         cli.ui.print_error(f"Watch failed: {e}")
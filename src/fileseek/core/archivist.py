@@ -1,17 +1,22 @@
-from typing import List, Dict, Optional, Union, Tuple
+from typing import List, Dict, Optional, Union, Tuple, Iterable, Callable
 from pathlib import Path
 import hashlib
 import mimetypes
 from datetime import datetime
 import logging
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from fileseek.storage.db_manager import DBManager
 from fileseek.storage.vector_store import create_vector_store, VectorStore
 from fileseek.pipeline.embedding_module import EmbeddingGenerator
 from fileseek.core.search_service import SearchService, SearchResult
 from fileseek.core.config import ConfigManager, FileSeekConfig
-from fileseek.pipeline.pipeline import ProcessingPipeline
+from fileseek.pipeline.pipeline import ProcessingPipeline, ProcessingResult
+
+# Number of extracted files whose chunks are embedded together
+EMBED_BATCH_FILES = 16
 
 class Archivist:
     """Core coordinator for the FileSeek system."""
@@ -51,9 +56,10 @@ class Archivist:
             )
             
             # Initialize pipeline with progress callback
+            self.max_workers = self.config.get('processing.max_workers', 4)
             self.pipeline = ProcessingPipeline(
                 config=self.config,
-                max_workers=self.config.get('processing.max_workers', 4),
+                max_workers=self.max_workers,
                 progress_callback=lambda x: logging.info(f"Processing progress: {x*100:.0f}%")
             )
             
@@ -76,57 +82,141 @@ class Archivist:
                     metadata: Optional[Dict] = None) -> bool:
         """Ingest a file into the archive."""
         try:
-            file_path = Path(file_path)
-            if not file_path.exists():
-                logging.error(f"File not found: {file_path}")
-                return False
-                
-            # Generate file hash
-            file_hash = self._hash_file(file_path)
-            
-            # Check if file already exists and is unchanged
-            existing_doc = self.db_manager.get_document_by_path(str(file_path))
-            if existing_doc and existing_doc['file_hash'] == file_hash:
-                logging.info(f"File unchanged: {file_path}")
-                return True
-                
-            # Process document using pipeline
-            processing_result = self.pipeline.process_file(file_path)
-            content = processing_result.text_content
-            chunks = processing_result.chunks
-            embeddings = processing_result.embeddings
-            
-            if not content:
-                logging.error(f"No content extracted from file: {file_path}")
-                return False
-                
-            # Store document in database
-            doc_id = self.db_manager.add_document(
-                str(file_path),
-                file_hash,
-                mimetypes.guess_type(file_path)[0] or 'application/octet-stream',
-                metadata
-            )
-            
-            # Store embeddings
-            chunk_ids = []
-            for i, (embedding, chunk) in enumerate(zip(embeddings, chunks)):
-                chunk_id = f"{doc_id}_{i}"
-                chunk_ids.append(chunk_id)
-                
-                # Store chunk text and metadata
-                self.db_manager.add_embedding(doc_id, i, chunk, chunk_id)
-            
-            # Add to vector store
-            self.vector_store.add_vectors(embeddings, chunk_ids)
-            
-            logging.info(f"Successfully ingested: {file_path}")
-            return True
-            
+            return self.ingest_files([file_path], metadata)[Path(file_path)]
         except Exception as e:
             logging.error(f"Error ingesting file {file_path}: {e}")
             return False
 
+    def ingest_files(self,
+                     file_paths: Iterable[Union[str, Path]],
+                     metadata: Optional[Dict] = None,
+                     on_complete: Optional[Callable[[Path, bool], None]] = None) -> Dict[Path, bool]:
+        """Ingest many files, running text extraction in a worker pool.
+        
+        Detection, extraction and OCR run in worker threads. Embedding and
+        database and vector store writes stay on the calling thread, since
+        the shared model, the SQLite connection and the index are not safe
+        to use concurrently; embeddings are batched across files instead.
+        """
+        results: Dict[Path, bool] = {}
+        
+        def finish(file_path: Path, success: bool):
+            results[file_path] = success
+            if on_complete:
+                on_complete(file_path, success)
+        
+        def embed_and_store(extracted: List[Tuple[Tuple[Path, str, int], ProcessingResult]]):
+            if not extracted:
+                return
+            processing_results = self.pipeline.embed_results([result for _, result in extracted])
+            for ((file_path, file_hash, mtime_ns), _), processing_result in zip(extracted, processing_results):
+                try:
+                    success = self._store_processing_result(
+                        file_path, file_hash, mtime_ns, processing_result, metadata
+                    )
+                except Exception as e:
+                    logging.error(f"Error ingesting file {file_path}: {e}")
+                    success = False
+                finish(file_path, success)
+        
+        # Hash files and skip unchanged ones before any heavy processing
+        pending = []
+        file_paths = [Path(file_path) for file_path in file_paths]
+        existing_docs = self.db_manager.get_documents_by_paths(str(p) for p in file_paths)
+        for file_path in file_paths:
+            try:
+                if not file_path.exists():
+                    logging.error(f"File not found: {file_path}")
+                    finish(file_path, False)
+                    continue
+                    
+                mtime_ns = file_path.stat().st_mtime_ns
+                file_hash = self._hash_file(file_path)
+                existing_doc = existing_docs.get(str(file_path.absolute()))
+                if existing_doc and existing_doc['file_hash'] == file_hash:
+                    logging.info(f"File unchanged: {file_path}")
+                    self.db_manager.update_document_mtime(existing_doc['id'], mtime_ns)
+                    finish(file_path, True)
+                    continue
+                    
+                pending.append((file_path, file_hash, mtime_ns))
+            except Exception as e:
+                logging.error(f"Error ingesting file {file_path}: {e}")
+                finish(file_path, False)
+        
+        if not pending:
+            return results
+        
+        # Share one worker budget between files and the OCR pages within
+        # each file, so at most max_workers tesseract processes run at once
+        ingest_workers = min(self.max_workers, len(pending))
+        ocr_processor = self.pipeline.ocr_processor
+        ocr_workers = ocr_processor.max_workers if ocr_processor else None
+        if ocr_processor:
+            ocr_processor.max_workers = max(1, ocr_workers // ingest_workers)
+        
+        try:
+            with ThreadPoolExecutor(max_workers=ingest_workers) as executor:
+                future_to_file = {
+                    executor.submit(self.pipeline.extract_file, file_path): (file_path, file_hash, mtime_ns)
+                    for file_path, file_hash, mtime_ns in pending
+                }
+                
+                # Embed and store on this thread as extractions complete,
+                # while the pool keeps extracting the remaining files
+                extracted = []
+                for future in as_completed(future_to_file):
+                    file_entry = future_to_file[future]
+                    try:
+                        extracted.append((file_entry, future.result()))
+                    except Exception as e:
+                        logging.error(f"Error ingesting file {file_entry[0]}: {e}")
+                        finish(file_entry[0], False)
+                        continue
+                    if len(extracted) >= EMBED_BATCH_FILES:
+                        embed_and_store(extracted)
+                        extracted = []
+                embed_and_store(extracted)
+        finally:
+            if ocr_processor:
+                ocr_processor.max_workers = ocr_workers
+        
+        return results
+
+    def _store_processing_result(self,
+                                 file_path: Path,
+                                 file_hash: str,
+                                 mtime_ns: int,
+                                 processing_result: ProcessingResult,
+                                 metadata: Optional[Dict] = None) -> bool:
+        """Store a processed document, its chunks and its vectors."""
+        content = processing_result.text_content
+        chunks = processing_result.chunks
+        embeddings = processing_result.embeddings
+        
+        if not content:
+            logging.error(f"No content extracted from file: {file_path}")
+            return False
+            
+        # Store document in database
+        doc_id = self.db_manager.add_document(
+            str(file_path),
+            file_hash,
+            mimetypes.guess_type(file_path)[0] or 'application/octet-stream',
+            metadata,
+            mtime_ns
+        )
+        
+        # Store chunk text and metadata in a single transaction
+        chunk_ids = [f"{doc_id}_{i}" for i in range(len(chunks))]
+        self.db_manager.add_embeddings(doc_id, chunks, chunk_ids)
+        
+        # Add to vector store
+        self.vector_store.add_vectors(embeddings, chunk_ids)
+        
+        logging.info(f"Successfully ingested: {file_path}")
+        return True
+
     def search(self, 
                query: str, 
                limit: int = None, 
@@ -166,11 +256,8 @@ class Archivist:
 
     def _hash_file(self, file_path: Path) -> str:
         """Generate hash for a file."""
-        hasher = hashlib.sha256()
         with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(4096), b''):
-                hasher.update(chunk)
-        return hasher.hexdigest()
+            return hashlib.file_digest(f, 'sha256').hexdigest()
 
     def _read_file(self, file_path: Path) -> Optional[str]:
         """Read file content."""
@@ -225,19 +312,32 @@ class Archivist:
 
     def get_documents_in_directory(self, directory: Union[str, Path], recursive: bool = False) -> List[Dict]:
         """Get all documents in a directory."""
-        directory = Path(directory).resolve()
-        docs = self.db_manager.get_all_documents()
+        return self.get_documents_in_directories([directory], recursive)
+
+    def get_documents_in_directories(self, directories: List[Union[str, Path]], recursive: bool = False) -> List[Dict]:
+        """Get all documents in any of the given directories using a single query."""
+        # Stored paths are absolute but not resolved, so match both forms
+        targets = set()
+        for directory in directories:
+            directory = Path(directory)
+            targets.update((directory.absolute(), directory.resolve()))
+        if not targets:
+            return []
+        
+        prefixes = {str(target).rstrip(os.sep) + os.sep for target in targets}
+        docs = self.db_manager.get_documents_by_path_prefixes(prefixes)
         
-        # Filter documents in target directory
+        # Filter documents in target directories
         result = []
         for doc in docs:
-            doc_path = Path(doc['path']).resolve()
+            # Compare stored paths as-is to avoid a resolve() syscall per document
+            doc_path = Path(doc['path'])
             try:
-                # Check if document is in target directory
+                # Check if document is in a target directory
                 if recursive:
-                    is_target = directory in doc_path.parents or directory == doc_path.parent
+                    is_target = any(parent in targets for parent in doc_path.parents)
                 else:
-                    is_target = directory == doc_path.parent
+                    is_target = doc_path.parent in targets
                     
                 if is_target:
                     result.append(doc)
@@ -354,8 +354,10 @@ DEFAULT_CONFIG = {
         "enabled": True,  # Make OCR optional
         "languages": ["eng"],  # Default to English
         "preprocess_images": True,
+        "denoise": True,  # Non-local means denoising; median blur if disabled
         "confidence_threshold": 60,  # Minimum confidence score 0-100
-        "tesseract_path": None  # Will use system installation if None
+        "tesseract_path": None,  # Will use system installation if None
+        "cache_dir": "~/.fileseek/cache/ocr"  # OCR result cache, disabled if None
     },
     "search": {
         "minimum_similarity": 0.7,  # Add minimum similarity threshold
@@ -148,7 +148,7 @@ class EmbeddingGenerator:
 
     def _generate_batch_embeddings(self, chunks: List[str]) -> np.ndarray:
         """Generate embeddings for a batch of chunks, using cache if available."""
-        embeddings = []
+        embeddings = [None] * len(chunks)
         uncached_chunks = []
         uncached_indices = []
         
@@ -156,7 +156,7 @@ class EmbeddingGenerator:
         for i, chunk in enumerate(chunks):
             cache_key = hash(chunk)
             if cache_key in self.cache:
-                embeddings.append(self.cache[cache_key])
+                embeddings[i] = self.cache[cache_key]
             else:
                 uncached_chunks.append(chunk)
                 uncached_indices.append(i)
@@ -171,11 +171,11 @@ class EmbeddingGenerator:
                     convert_to_numpy=True
                 )
             
-            # Update cache
+            # Update cache, keeping embeddings in chunk order
             for i, chunk in enumerate(uncached_chunks):
                 cache_key = hash(chunk)
                 self.cache[cache_key] = batch_embeddings[i]
-                embeddings.append(batch_embeddings[i])
+                embeddings[uncached_indices[i]] = batch_embeddings[i]
         
         return np.array(embeddings)
 
@@ -184,29 +184,62 @@ class EmbeddingGenerator:
                         metadata: Optional[Dict] = None,
                         show_progress: bool = True) -> tuple[np.ndarray, List[str], List[Dict]]:
         """Process a document and return embeddings, chunks, and metadata."""
-        # Chunk the text
-        chunks = self.chunker.chunk_text(text)
+        return self.process_documents([text], [metadata], show_progress)[0]
+
+    def process_documents(self,
+                          texts: List[str],
+                          metadatas: Optional[List[Optional[Dict]]] = None,
+                          show_progress: bool = True) -> List[tuple[np.ndarray, List[str], List[Dict]]]:
+        """Process several documents, encoding their chunks together in shared batches."""
+        if metadatas is None:
+            metadatas = [None] * len(texts)
+        
+        # Chunk every document, then embed all chunks in one pass
+        document_chunks = [self.chunker.chunk_text(text) for text in texts]
+        all_chunks = [chunk for chunks in document_chunks for chunk in chunks]
+        all_embeddings = self._embed_chunks(all_chunks, show_progress)
+        
+        # Split embeddings back per document
+        results = []
+        offset = 0
+        for text, chunks, metadata in zip(texts, document_chunks, metadatas):
+            if not chunks:
+                results.append((np.array([]), [], []))
+                continue
+            embeddings = all_embeddings[offset:offset + len(chunks)]
+            offset += len(chunks)
+            results.append((embeddings, chunks, self._chunk_metadata(text, chunks, metadata)))
+        
+        # Save cache periodically (for example, every 1000 additions)
+        if self.cache_dir and (len(self.cache) % 1000) == 0:
+            self._save_cache()
+            
+        return results
+
+    def _embed_chunks(self, chunks: List[str], show_progress: bool = True) -> np.ndarray:
+        """Embed chunks in batches of batch_size."""
         if not chunks:
-            return np.array([]), [], []
+            return np.array([])
         
         # Process all chunks in one go if possible
         if len(chunks) <= self.batch_size:
-            embeddings = self._generate_batch_embeddings(chunks)
-        else:
-            # Process chunks in batches
-            embeddings = []
-            total_batches = (len(chunks) + self.batch_size - 1) // self.batch_size
-            
-            with tqdm(total=total_batches, disable=not show_progress) as pbar:
-                for i in range(0, len(chunks), self.batch_size):
-                    batch = chunks[i:i + self.batch_size]
-                    batch_embeddings = self._generate_batch_embeddings(batch)
-                    embeddings.extend(batch_embeddings)
-                    pbar.update(1)
-            
-            embeddings = np.array(embeddings)
+            return self._generate_batch_embeddings(chunks)
+        
+        # Process chunks in batches
+        embeddings = []
+        total_batches = (len(chunks) + self.batch_size - 1) // self.batch_size
+        
+        with tqdm(total=total_batches, disable=not show_progress) as pbar:
+            for i in range(0, len(chunks), self.batch_size):
+                batch = chunks[i:i + self.batch_size]
+                batch_embeddings = self._generate_batch_embeddings(batch)
+                embeddings.extend(batch_embeddings)
+                pbar.update(1)
         
-        # Prepare chunk metadata
+        return np.array(embeddings)
+
+    def _chunk_metadata(self, text: str, chunks: List[str], metadata: Optional[Dict]) -> List[Dict]:
+        """Prepare metadata for each chunk of a document."""
         chunk_metadata = []
         for i, chunk in enumerate(chunks):
             chunk_meta = {
@@ -217,12 +250,7 @@ class EmbeddingGenerator:
             if metadata:
                 chunk_meta.update(metadata)
             chunk_metadata.append(chunk_meta)
-        
-        # Save cache periodically (for example, every 1000 additions)
-        if self.cache_dir and (len(self.cache) % 1000) == 0:
-            self._save_cache()
-            
-        return embeddings, chunks, chunk_metadata
+        return chunk_metadata
 
     def get_embedding_dimension(self) -> int:
         """Return the dimension of the embeddings."""
@@ -1,4 +1,4 @@
-from pathlib import Path
+from pathlib import Path, PurePath
 from typing import Optional, Dict, List, Set, Tuple, Union
 import mimetypes
 import magic
@@ -6,6 +6,9 @@ import chardet
 import logging
 from dataclasses import dataclass
 import os
+import re
+import stat
+import fnmatch
 import json
 from fileseek.core.config import ConfigManager
 from datetime import datetime
@@ -21,6 +24,45 @@ class FileInfo:
     can_read: bool
     metadata: Dict
 
+class PathPatternMatcher:
+    """Matches paths against glob patterns using precompiled regexes.
+    
+    Follows PurePath.match semantics: a relative pattern matches the last
+    components of a path, an absolute pattern must match the whole path.
+    Patterns with the same number of components are combined into a single
+    regex, so a path is checked with one match per component count instead
+    of one PurePath.match call per pattern.
+    """
+    
+    def __init__(self, patterns: Optional[List[str]] = None):
+        flags = re.IGNORECASE if os.name == 'nt' else 0
+        grouped: Dict[Tuple[int, bool], List[str]] = {}
+        for pattern in patterns or []:
+            if not pattern:
+                continue
+            pattern_path = PurePath(pattern)
+            parts = pattern_path.parts
+            key = (len(parts), pattern_path.is_absolute())
+            grouped.setdefault(key, []).append(fnmatch.translate('/'.join(parts)))
+        
+        self._groups = [
+            (count, is_absolute, re.compile('|'.join(f'(?:{regex})' for regex in regexes), flags))
+            for (count, is_absolute), regexes in grouped.items()
+        ]
+
+    def __bool__(self) -> bool:
+        return bool(self._groups)
+
+    def match(self, path: Union[str, PurePath]) -> bool:
+        """Check if a path matches any of the patterns."""
+        parts = PurePath(path).parts
+        for count, is_absolute, regex in self._groups:
+            if len(parts) < count or (is_absolute and len(parts) != count):
+                continue
+            if regex.fullmatch('/'.join(parts[-count:])):
+                return True
+        return False
+
 class FileTypeHandler:
     """Base class for file type handlers."""
     
@@ -116,6 +158,11 @@ class FileDetector:
         self.excluded_directories = self.config.get('processing.excluded_directories')
         self.max_file_size = self.config.get('storage.max_file_size')
         
+        # Precompute lookup structures used by should_process_file
+        self._supported_suffixes = frozenset(ext.lower() for ext in self.supported_extensions)
+        self._excluded_directory_set = frozenset(self.excluded_directories)
+        self._excluded_matcher = PathPatternMatcher(self.excluded_patterns)
+        
         # Initialize mime types
         mimetypes.init()
         
@@ -275,33 +322,40 @@ class FileDetector:
             supported.update(types)
         return supported 
 
-    def should_process_file(self, path: Path) -> bool:
-        """Determine if a file should be processed."""
-        # Check if file exists and is readable
-        if not path.is_file() or not os.access(path, os.R_OK):
+    def should_process_file(self, path: Path, stat_result: Optional[os.stat_result] = None) -> bool:
+        """Determine if a file should be processed.
+        
+        stat_result: Already available stat information for path (e.g. from
+                     os.DirEntry.stat), saving a stat call.
+        """
+        # Check file extension
+        if path.suffix.lower() not in self._supported_suffixes:
             return False
 
         # Check if file is in excluded directory
-        for excluded_dir in self.excluded_directories:
-            if excluded_dir in path.parts:
-                return False
-
-        # Check file extension
-        if path.suffix.lower() not in self.supported_extensions:
+        if not self._excluded_directory_set.isdisjoint(path.parts):
             return False
 
         # Check against excluded patterns
-        for pattern in self.excluded_patterns:
-            if path.match(pattern):
-                return False
+        if self._excluded_matcher.match(path):
+            return False
         
-        # Check file size
+        # Check file type and size with a single stat call
         try:
-            if path.stat().st_size > self.max_file_size:
-                logging.warning(f"File {path} exceeds maximum size limit of {self.max_file_size/1024/1024:.1f}MB")
-                return False
+            st = stat_result or path.stat()
+        except FileNotFoundError:
+            # File vanished before it could be checked (e.g. temp files)
+            return False
         except OSError as e:
             logging.error(f"Error checking file size for {path}: {e}")
             return False
 
-        return True
\ No newline at end of file
+        # Check if file is a regular file and readable
+        if not stat.S_ISREG(st.st_mode) or not os.access(path, os.R_OK):
+            return False
+
+        if st.st_size > self.max_file_size:
+            logging.warning(f"File {path} exceeds maximum size limit of {self.max_file_size/1024/1024:.1f}MB")
+            return False
+
+        return True
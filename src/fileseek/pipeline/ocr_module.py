@@ -3,16 +3,20 @@ from typing import Optional, List, Dict, Union, Tuple
 import logging
 import tempfile
 from dataclasses import dataclass
+import hashlib
+import json
 import pytesseract
 from PIL import Image
 import pdf2image
 import numpy as np
-from concurrent.futures import ThreadPoolExecutor
+import cv2
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from tqdm import tqdm
 import subprocess
 import sys
 import platform
 import os
+import threading
 
 @dataclass
 class OCRResult:
@@ -23,29 +27,129 @@ class OCRResult:
     page_number: Optional[int] = None
     bounding_boxes: Optional[List[Dict]] = None
 
+# Number of scanned PDF pages passed to one tesseract run
+OCR_BATCH_SIZE = 8
+
+# CLAHE contrast enhancement parameters
+CLAHE_CLIP_LIMIT = 2.0
+CLAHE_TILE_GRID_SIZE = (8, 8)
+
+# Minimum embedded text per PDF page to skip OCR for that page
+MIN_TEXT_LAYER_CHARS = 50
+MIN_TEXT_LAYER_ALNUM_RATIO = 0.5
+
+class OCRCache:
+    """Disk cache of OCR results keyed by file content and OCR settings."""
+    
+    def __init__(self, cache_dir: Union[str, Path], settings: Dict):
+        """Initialize cache.
+        
+        cache_dir: Directory holding one JSON file per cached document.
+        settings: Everything besides file content that affects OCR output.
+        
+        Raises OSError if the cache directory cannot be created.
+        """
+        self.cache_dir = Path(cache_dir).expanduser()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._settings_key = json.dumps(settings, sort_keys=True, default=str)
+
+    def key_for(self, file_path: Union[str, Path]) -> str:
+        """Build the cache key for a file from its content hash and settings."""
+        with open(file_path, 'rb') as f:
+            content_hash = hashlib.file_digest(f, 'sha256').hexdigest()
+        return hashlib.sha256(f"{content_hash}:{self._settings_key}".encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[List[OCRResult]]:
+        """Get cached results, or None if not cached."""
+        cache_file = self.cache_dir / f"{key}.json"
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                return [OCRResult(**result) for result in json.load(f)]
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logging.warning(f"Ignoring unreadable OCR cache entry {cache_file}: {e}")
+            return None
+
+    def put(self, key: str, results: List[OCRResult]):
+        """Store results in the cache.
+        
+        Only the fields consumed downstream are stored; bounding boxes are
+        dropped to keep entries small.
+        """
+        cache_file = self.cache_dir / f"{key}.json"
+        temp_file = None
+        entries = [
+            {
+                'text': result.text,
+                'confidence': result.confidence,
+                'language': result.language,
+                'page_number': result.page_number
+            }
+            for result in results
+        ]
+        try:
+            # Unique temp file, so concurrent writers in other processes never collide
+            fd, temp_file = tempfile.mkstemp(dir=self.cache_dir, prefix=f"{key}.", suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, default=float)
+            # Atomic rename so concurrent readers never see partial entries
+            os.replace(temp_file, cache_file)
+        except Exception as e:
+            logging.warning(f"Failed to write OCR cache entry {cache_file}: {e}")
+            if temp_file:
+                Path(temp_file).unlink(missing_ok=True)
+
 class ImagePreprocessor:
     """Handles image preprocessing for better OCR results."""
     
-    @staticmethod
-    def preprocess(image: Image.Image) -> Image.Image:
-        """Preprocess image for better OCR results."""
+    def __init__(self, denoise: bool = True):
+        """Initialize preprocessor.
+        
+        denoise: Use non-local means denoising. When disabled, a cheap
+                 median blur is used instead, which is sufficient for
+                 clean, high-DPI scans.
+        """
+        self.denoise = denoise
+        # CLAHE objects keep internal buffers, so each thread gets its own
+        self._local = threading.local()
+
+    @property
+    def _clahe(self) -> "cv2.CLAHE":
+        """Get the CLAHE instance for the current thread."""
+        clahe = getattr(self._local, 'clahe', None)
+        if clahe is None:
+            clahe = cv2.createCLAHE(clipLimit=CLAHE_CLIP_LIMIT, tileGridSize=CLAHE_TILE_GRID_SIZE)
+            self._local.clahe = clahe
+        return clahe
+    
+    def preprocess(self, image: Union[Image.Image, np.ndarray]) -> Union[Image.Image, np.ndarray]:
+        """Preprocess image for better OCR results.
+        
+        Returns the processed grayscale array, which pytesseract accepts
+        directly, or the original image if preprocessing fails.
+        """
         try:
             # Convert to grayscale
-            if image.mode != 'L':
-                image = image.convert('L')
+            if isinstance(image, np.ndarray):
+                img_array = image
+                if img_array.ndim == 3:
+                    img_array = cv2.cvtColor(img_array, cv2.COLOR_RGB2GRAY)
+            else:
+                if image.mode != 'L':
+                    image = image.convert('L')
+                img_array = np.asarray(image)
             
             # Increase contrast
-            import cv2
-            import numpy as np
-            img_array = np.array(image)
-            clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8,8))
-            img_array = clahe.apply(img_array)
+            img_array = self._clahe.apply(img_array)
             
             # Denoise
-            img_array = cv2.fastNlMeansDenoising(img_array)
+            if self.denoise:
+                img_array = cv2.fastNlMeansDenoising(img_array)
+            else:
+                img_array = cv2.medianBlur(img_array, 3)
             
-            # Convert back to PIL Image
-            return Image.fromarray(img_array)
+            return img_array
             
         except Exception as e:
             logging.warning(f"Image preprocessing failed: {e}")
@@ -65,10 +169,13 @@ class OCRProcessor(BaseOCRProcessor):
                  preprocess_images: bool = True,
                  confidence_threshold: int = 60,
                  tesseract_path: Optional[str] = None,
-                 max_workers: int = 4):
+                 max_workers: int = 4,
+                 denoise: bool = True,
+                 cache_dir: Optional[Union[str, Path]] = None):
         """Initialize OCR processor."""
         self.languages = languages
         self.preprocess_images = preprocess_images
+        self.preprocessor = ImagePreprocessor(denoise=denoise)
         self.confidence_threshold = confidence_threshold
         self.max_workers = max_workers
         
@@ -83,6 +190,22 @@ class OCRProcessor(BaseOCRProcessor):
             pytesseract.get_languages()
         except Exception as e:
             raise RuntimeError(f"Tesseract not properly configured: {e}")
+        
+        # Initialize OCR result cache; OCR still works without it
+        self.cache = None
+        if cache_dir:
+            try:
+                self.cache = OCRCache(cache_dir, {
+                    'languages': self.languages,
+                    'preprocess_images': preprocess_images,
+                    'denoise': denoise,
+                    'confidence_threshold': confidence_threshold,
+                    'min_text_layer_chars': MIN_TEXT_LAYER_CHARS,
+                    'min_text_layer_alnum_ratio': MIN_TEXT_LAYER_ALNUM_RATIO,
+                    'tesseract_version': pytesseract.get_tesseract_version()
+                })
+            except OSError as e:
+                logging.warning(f"OCR cache disabled, cannot create {cache_dir}: {e}")
 
     def _check_dependencies(self):
         """Check if all required system dependencies are installed."""
@@ -118,11 +241,14 @@ class OCRProcessor(BaseOCRProcessor):
             
             # Handle PDFs
             if file_path.suffix.lower() == '.pdf':
-                return self._process_pdf(file_path)
+                results = self.process_pdf(file_path, show_progress=False)
+                texts = [result.text for result in results if result.text.strip()]
+                return '\n\n'.join(texts) if texts else None
                 
             # Handle images
-            elif file_path.suffix.lower() in ['.png', '.jpg', '.jpeg', '.tiff', '.bmp']:
-                return self._process_image(file_path)
+            elif file_path.suffix.lower() in ['.png', '.jpg', '.jpeg', '.tif', '.tiff', '.bmp']:
+                result = self.process_image(file_path)
+                return result.text if result and result.text.strip() else None
                 
             return None
             
@@ -130,46 +256,25 @@ class OCRProcessor(BaseOCRProcessor):
             logging.error(f"OCR processing failed: {e}", exc_info=True)
             return None
 
-    def _process_pdf(self, file_path: Path) -> Optional[str]:
-        """Process a PDF file."""
-        try:
-            # Convert PDF to images
-            images = pdf2image.convert_from_path(file_path)
-            
-            # Process each page
-            texts = []
-            for img in images:
-                text = pytesseract.image_to_string(img, lang='+'.join(self.languages))
-                if text.strip():
-                    texts.append(text)
-                    
-            return '\n\n'.join(texts) if texts else None
-            
-        except Exception as e:
-            logging.error(f"PDF OCR failed: {e}")
-            return None
-
-    def _process_image(self, file_path: Path) -> Optional[str]:
-        """Process an image file."""
-        try:
-            # Open and process image
-            with Image.open(file_path) as img:
-                text = pytesseract.image_to_string(img, lang='+'.join(self.languages))
-                return text if text.strip() else None
-                
-        except Exception as e:
-            logging.error(f"Image OCR failed: {e}")
-            return None
-
-    def process_image(self, image_path: Union[str, Path]) -> Optional[OCRResult]:
-        """Process a single image file."""
+    def process_image(self, image_path: Union[str, Path, Image.Image, np.ndarray]) -> Optional[OCRResult]:
+        """Process a single image file or an already loaded image."""
         try:
-            # Load image
-            image = Image.open(image_path)
+            # Load image unless it is already in memory
+            cache_key = None
+            if isinstance(image_path, (Image.Image, np.ndarray)):
+                image = image_path
+            else:
+                # Only files can be looked up in the cache
+                if self.cache:
+                    cache_key = self.cache.key_for(image_path)
+                    cached = self.cache.get(cache_key)
+                    if cached:
+                        return cached[0]
+                image = Image.open(image_path)
             
             # Preprocess if enabled
             if self.preprocess_images:
-                image = ImagePreprocessor.preprocess(image)
+                image = self.preprocessor.preprocess(image)
             
             # Perform OCR
             ocr_data = pytesseract.image_to_data(
@@ -178,85 +283,228 @@ class OCRProcessor(BaseOCRProcessor):
                 output_type=pytesseract.Output.DICT
             )
             
-            # Extract text and confidence
-            text_parts = []
-            confidences = []
-            boxes = []
-            
-            for i, conf in enumerate(ocr_data['conf']):
-                if conf > self.confidence_threshold:
-                    text_parts.append(ocr_data['text'][i])
-                    confidences.append(conf)
-                    
-                    # Store bounding box
-                    boxes.append({
-                        'text': ocr_data['text'][i],
-                        'conf': conf,
-                        'left': ocr_data['left'][i],
-                        'top': ocr_data['top'][i],
-                        'width': ocr_data['width'][i],
-                        'height': ocr_data['height'][i]
-                    })
-            
-            # Calculate average confidence
-            avg_confidence = np.mean(confidences) if confidences else 0.0
-            
-            return OCRResult(
-                text=' '.join(text_parts),
-                confidence=avg_confidence,
-                language='+'.join(self.languages),
-                bounding_boxes=boxes
-            )
+            conf = np.asarray(ocr_data['conf'], dtype=np.float32)
+            result = self._build_result(ocr_data, conf, np.arange(conf.size))
+            if cache_key:
+                self.cache.put(cache_key, [result])
+            return result
             
         except Exception as e:
             logging.error(f"Error processing image {image_path}: {e}")
             return None
 
+    def _build_result(self,
+                      ocr_data: Dict,
+                      conf: np.ndarray,
+                      rows: np.ndarray,
+                      page_number: Optional[int] = None) -> OCRResult:
+        """Build an OCRResult from tesseract data rows above the confidence threshold."""
+        # Select words above the confidence threshold in one vectorized pass
+        indices = rows[conf[rows] > self.confidence_threshold]
+        
+        # Extract text and bounding boxes
+        texts = ocr_data['text']
+        text_parts = [texts[i] for i in indices]
+        boxes = [
+            {
+                'text': texts[i],
+                'conf': ocr_data['conf'][i],
+                'left': ocr_data['left'][i],
+                'top': ocr_data['top'][i],
+                'width': ocr_data['width'][i],
+                'height': ocr_data['height'][i]
+            }
+            for i in indices
+        ]
+        
+        # Calculate average confidence
+        avg_confidence = float(conf[indices].mean()) if indices.size else 0.0
+        
+        return OCRResult(
+            text=' '.join(text_parts),
+            confidence=avg_confidence,
+            language='+'.join(self.languages),
+            page_number=page_number,
+            bounding_boxes=boxes
+        )
+
     def process_pdf(self, 
                    pdf_path: Union[str, Path],
                    show_progress: bool = True) -> List[OCRResult]:
-        """Process a PDF file."""
+        """Process a PDF file.
+        
+        Pages with a usable embedded text layer, or without any images, are
+        returned from the text layer as-is; only pages that lack a usable
+        text layer and contain images are rendered and run through OCR.
+        """
         try:
-            # Convert PDF to images
-            images = pdf2image.convert_from_path(pdf_path)
+            # Reuse results for previously processed content
+            cache_key = None
+            if self.cache:
+                cache_key = self.cache.key_for(pdf_path)
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    logging.info(f"Using cached OCR results for {pdf_path}")
+                    return cached
+            
+            # Extract embedded text per page before falling back to OCR
+            page_layers = self._extract_text_layer(pdf_path)
+            
+            # Results are stored by page index so they stay in page order
+            page_results: List[Optional[OCRResult]] = [None] * len(page_layers)
+            scanned_pages = []
+            for i, (text, has_images) in enumerate(page_layers):
+                if has_images and not self._has_text_layer(text):
+                    scanned_pages.append(i)
+                elif text.strip():
+                    # Pages without images have nothing for OCR to recover
+                    page_results[i] = self._text_layer_result(text, i)
             
-            results = []
+            # Split scanned pages into small fixed-size batches. Each batch is
+            # run by a single tesseract process, so language data is loaded
+            # once per batch rather than once per page, while rendering and OCR
+            # of different batches still overlap across workers
+            batches = [
+                scanned_pages[i:i + OCR_BATCH_SIZE]
+                for i in range(0, len(scanned_pages), OCR_BATCH_SIZE)
+            ]
             with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                # Create temporary directory for images
-                with tempfile.TemporaryDirectory() as temp_dir:
-                    # Save images to temporary files
-                    temp_images = []
-                    for i, image in enumerate(images):
-                        temp_path = Path(temp_dir) / f"page_{i}.png"
-                        image.save(temp_path)
-                        temp_images.append(temp_path)
-                    
-                    # Process images in parallel
-                    futures = [
-                        executor.submit(self._process_pdf_page, path, i)
-                        for i, path in enumerate(temp_images)
-                    ]
-                    
-                    # Collect results
-                    for future in tqdm(futures, 
-                                     desc="Processing PDF pages",
-                                     disable=not show_progress):
-                        result = future.result()
-                        if result:
-                            results.append(result)
+                future_to_batch = {
+                    executor.submit(self._process_pdf_pages, pdf_path, batch): batch
+                    for batch in batches
+                }
+                
+                # Collect results as batches complete
+                with tqdm(total=len(scanned_pages),
+                          desc="Processing PDF pages",
+                          disable=not show_progress) as pbar:
+                    for future in as_completed(future_to_batch):
+                        batch = future_to_batch[future]
+                        try:
+                            for page_number, result in zip(batch, future.result()):
+                                page_results[page_number] = result
+                        except Exception as e:
+                            logging.error(f"Error processing pages {batch} of {pdf_path}: {e}")
+                        pbar.update(len(batch))
+            
+            failed_pages = [i for i in scanned_pages if page_results[i] is None]
             
+            # Keep a short text layer unless OCR recovered more text from the page
+            for i in scanned_pages:
+                text = page_layers[i][0].strip()
+                if not text:
+                    continue
+                ocr_result = page_results[i]
+                if ocr_result is None or len(ocr_result.text.strip()) <= len(text):
+                    page_results[i] = self._text_layer_result(page_layers[i][0], i)
+            
+            results = [result for result in page_results if result]
+            
+            # Only cache complete results, so a transient tesseract or
+            # poppler failure is retried on the next ingest. PDFs that never
+            # reach tesseract are cheap to re-read and are not cached at all
+            if failed_pages:
+                logging.warning(f"OCR failed for pages {failed_pages} of {pdf_path}, not caching results")
+            elif cache_key and scanned_pages and results:
+                self.cache.put(cache_key, results)
             return results
             
         except Exception as e:
             logging.error(f"Error processing PDF {pdf_path}: {e}")
             return []
 
-    def _process_pdf_page(self, image_path: Path, page_number: int) -> Optional[OCRResult]:
-        """Process a single PDF page."""
-        result = self.process_image(image_path)
-        if result:
-            result.page_number = page_number
-        return result
+    def _extract_text_layer(self, pdf_path: Union[str, Path]) -> List[Tuple[str, bool]]:
+        """Extract embedded text for each page and whether the page has images."""
+        try:
+            import pdfplumber
+            with pdfplumber.open(pdf_path) as pdf:
+                return [(page.extract_text() or '', bool(page.images)) for page in pdf.pages]
+        except Exception as e:
+            logging.warning(f"PDF text layer extraction failed, using OCR for all pages: {e}")
+            page_count = pdf2image.pdfinfo_from_path(pdf_path)['Pages']
+            return [('', True)] * page_count
+
+    def _text_layer_result(self, text: str, page_number: int) -> OCRResult:
+        """Build a result from a page's embedded text layer."""
+        return OCRResult(
+            text=text,
+            confidence=100.0,
+            language='+'.join(self.languages),
+            page_number=page_number
+        )
+
+    @staticmethod
+    def _has_text_layer(text: str) -> bool:
+        """Check if extracted page text is substantial enough to skip OCR."""
+        stripped = text.strip()
+        if len(stripped) < MIN_TEXT_LAYER_CHARS:
+            return False
+        
+        # Reject text layers that are mostly symbols (e.g. broken font encodings)
+        visible = [c for c in stripped if not c.isspace()]
+        alnum = sum(c.isalnum() for c in visible)
+        return alnum / len(visible) >= MIN_TEXT_LAYER_ALNUM_RATIO
+
+    def _process_pdf_pages(self, pdf_path: Union[str, Path], page_numbers: List[int]) -> List[Optional[OCRResult]]:
+        """Render PDF pages and OCR them with a single tesseract run.
+        
+        Pages are rendered and preprocessed one at a time and written to a
+        temporary directory, then passed to tesseract as a list file, which
+        it processes as a multi-page batch in one process. Returns one entry
+        per requested page, None for pages that could not be rendered.
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            rendered = []
+            for page_number in page_numbers:
+                try:
+                    image_path = self._render_pdf_page(pdf_path, page_number, Path(temp_dir))
+                except Exception as e:
+                    logging.error(f"Error rendering page {page_number} of {pdf_path}: {e}")
+                    continue
+                if image_path:
+                    rendered.append((page_number, image_path))
+            
+            if not rendered:
+                return [None] * len(page_numbers)
+            
+            list_path = Path(temp_dir) / "pages.txt"
+            list_path.write_text('\n'.join(str(image_path) for _, image_path in rendered) + '\n')
+            
+            # pytesseract passes string paths straight to tesseract
+            ocr_data = pytesseract.image_to_data(
+                str(list_path),
+                lang='+'.join(self.languages),
+                output_type=pytesseract.Output.DICT
+            )
+        
+        # tesseract numbers pages in list order starting at 1
+        conf = np.asarray(ocr_data['conf'], dtype=np.float32)
+        page_nums = np.asarray(ocr_data['page_num'], dtype=np.int32)
+        results = {
+            page_number: self._build_result(ocr_data, conf, np.flatnonzero(page_nums == i + 1), page_number)
+            for i, (page_number, _) in enumerate(rendered)
+        }
+        return [results.get(page_number) for page_number in page_numbers]
+
+    def _render_pdf_page(self, pdf_path: Union[str, Path], page_number: int, output_dir: Path) -> Optional[Path]:
+        """Render and preprocess a single PDF page into a PNG file."""
+        # pdf2image page numbers are 1-based
+        images = pdf2image.convert_from_path(
+            pdf_path,
+            first_page=page_number + 1,
+            last_page=page_number + 1
+        )
+        if not images:
+            return None
+        
+        image_path = output_dir / f"page_{page_number}.png"
+        with images[0] as image:
+            processed = self.preprocessor.preprocess(image) if self.preprocess_images else image
+            if isinstance(processed, np.ndarray):
+                cv2.imwrite(str(image_path), processed)
+            else:
+                processed.save(image_path)
+        return image_path
 
     @staticmethod
     def get_supported_languages() -> List[str]:
@@ -86,7 +86,9 @@ class ProcessingPipeline:
                     preprocess_images=self.config.get('ocr.preprocess_images', True),
                     confidence_threshold=self.config.get('ocr.confidence_threshold', 60),
                     tesseract_path=self.config.get('ocr.tesseract_path'),
-                    max_workers=self.max_workers
+                    max_workers=self.max_workers,
+                    denoise=self.config.get('ocr.denoise', True),
+                    cache_dir=self.config.get('ocr.cache_dir')
                 )
                 logging.info("OCR processor initialized successfully")
             except Exception as e:
@@ -98,6 +100,14 @@ class ProcessingPipeline:
 
     def process_file(self, file_path: Union[str, Path]) -> ProcessingResult:
         """Process a single file through the pipeline."""
+        return self.embed_results([self.extract_file(file_path)])[0]
+
+    def extract_file(self, file_path: Union[str, Path]) -> ProcessingResult:
+        """Detect a file and extract its text, without generating embeddings.
+        
+        Safe to call from worker threads; embedding is left to embed_results
+        so the shared model is only used from one thread.
+        """
         logging.info(f"\n=== Starting Processing for {file_path} ===")
         try:
             # Detect file
@@ -124,55 +134,60 @@ class ProcessingPipeline:
                 )
             logging.info(f"Text extracted successfully: {len(text_content)} characters")
             
-            # Generate embeddings
-            logging.info("Step 3: Embedding Generation")
-            try:
-                logging.info("Calling embedding_generator.process_document...")
-                result = self.embedding_generator.process_document(
-                    text_content,
-                    metadata=file_info.metadata,
-                    show_progress=bool(self.progress_callback)
+            return ProcessingResult(
+                file_info=file_info,
+                status=ProcessingStatus.PROCESSING,
+                text_content=text_content
+            )
+            
+        except Exception as e:
+            logging.error(f"Unexpected error processing file {file_path}: {str(e)}", exc_info=True)
+            return ProcessingResult(
+                file_info=file_info if 'file_info' in locals() else None,
+                status=ProcessingStatus.FAILED,
+                error=str(e)
+            )
+
+    def embed_results(self, results: List[ProcessingResult]) -> List[ProcessingResult]:
+        """Generate embeddings for extracted results, batching chunks across files."""
+        pending = [i for i, result in enumerate(results) if result.status == ProcessingStatus.PROCESSING]
+        if not pending:
+            return results
+        
+        results = list(results)
+        
+        # Generate embeddings
+        logging.info("Step 3: Embedding Generation")
+        try:
+            logging.info(f"Calling embedding_generator.process_documents for {len(pending)} documents...")
+            documents = self.embedding_generator.process_documents(
+                [results[i].text_content for i in pending],
+                [results[i].file_info.metadata for i in pending],
+                show_progress=bool(self.progress_callback)
+            )
+        except Exception as e:
+            logging.error(f"Error during embedding generation: {str(e)}", exc_info=True)
+            for i in pending:
+                results[i] = ProcessingResult(
+                    file_info=results[i].file_info,
+                    status=ProcessingStatus.FAILED,
+                    error=f"Embedding generation failed: {str(e)}"
                 )
-                
-                if not result:
-                    logging.error("Embedding generation returned None")
-                    return ProcessingResult(
-                        file_info=file_info,
-                        status=ProcessingStatus.FAILED,
-                        error="Embedding generation failed: returned None"
-                    )
-                
-                logging.info(f"Got result from process_document: {type(result)}")
-                logging.info(f"Result length: {len(result) if result else 'N/A'}")
-                
-                if len(result) != 3:
-                    logging.error(f"Unexpected result format: {result}")
-                    return ProcessingResult(
-                        file_info=file_info,
-                        status=ProcessingStatus.FAILED,
-                        error=f"Invalid embedding generation result: expected 3 items, got {len(result)}"
-                    )
-                    
-                embeddings, chunks, chunk_metadata = result  # Unpack the tuple correctly
-                
-                logging.info(f"Unpacked result - embeddings shape: {embeddings.shape if hasattr(embeddings, 'shape') else 'N/A'}")
-                logging.info(f"Chunks: {len(chunks)}, Metadata: {len(chunk_metadata)}")
-                
-                if embeddings.size == 0 or len(embeddings) == 0:
-                    logging.error("No embeddings generated")
-                    return ProcessingResult(
-                        file_info=file_info,
-                        status=ProcessingStatus.FAILED,
-                        error="No embeddings generated"
-                    )
-                    
-            except Exception as e:
-                logging.error(f"Error during embedding generation: {str(e)}", exc_info=True)
-                return ProcessingResult(
+            return results
+        
+        for i, (embeddings, chunks, chunk_metadata) in zip(pending, documents):
+            file_info = results[i].file_info
+            logging.info(f"Embeddings for {file_info.path}: {embeddings.shape if hasattr(embeddings, 'shape') else 'N/A'}")
+            logging.info(f"Chunks: {len(chunks)}, Metadata: {len(chunk_metadata)}")
+            
+            if embeddings.size == 0 or len(embeddings) == 0:
+                logging.error("No embeddings generated")
+                results[i] = ProcessingResult(
                     file_info=file_info,
                     status=ProcessingStatus.FAILED,
-                    error=f"Embedding generation failed: {str(e)}"
+                    error="No embeddings generated"
                 )
+                continue
             
             # Update metadata
             metadata = {
@@ -182,35 +197,33 @@ class ProcessingPipeline:
                 'embedding_dimension': self.embedding_generator.embedding_dimension
             }
             
-            logging.info("=== Processing Completed Successfully ===")
-            return ProcessingResult(
+            results[i] = ProcessingResult(
                 file_info=file_info,
                 status=ProcessingStatus.COMPLETED,
-                text_content=text_content,
+                text_content=results[i].text_content,
                 embeddings=embeddings,
                 chunks=chunks,
                 chunk_metadata=chunk_metadata,
                 metadata=metadata
             )
-            
-        except Exception as e:
-            logging.error(f"Unexpected error processing file {file_path}: {str(e)}", exc_info=True)
-            return ProcessingResult(
-                file_info=file_info if 'file_info' in locals() else None,
-                status=ProcessingStatus.FAILED,
-                error=str(e)
-            )
+        
+        logging.info("=== Processing Completed Successfully ===")
+        return results
 
     def process_batch(self, 
                      file_paths: List[Union[str, Path]],
                      show_progress: bool = True) -> List[ProcessingResult]:
-        """Process multiple files in parallel."""
+        """Process multiple files in parallel.
+        
+        Text extraction runs in parallel; embeddings are generated afterwards
+        on this thread in batches shared across files.
+        """
         results = []
         
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all files for processing
+            # Submit all files for extraction
             future_to_path = {
-                executor.submit(self.process_file, path): path
+                executor.submit(self.extract_file, path): path
                 for path in file_paths
             }
             
@@ -224,13 +237,7 @@ class ProcessingPipeline:
             
             for future, path in iterator:
                 try:
-                    result = future.result()
-                    results.append(result)
-                    
-                    # Update progress
-                    if self.progress_callback:
-                        self.progress_callback(path, result.status)
-                        
+                    results.append(future.result())
                 except Exception as e:
                     logging.error(f"Error processing {path}: {e}")
                     results.append(ProcessingResult(
@@ -239,6 +246,13 @@ class ProcessingPipeline:
                         error=str(e)
                     ))
         
+        results = self.embed_results(results)
+        
+        # Update progress
+        if self.progress_callback:
+            for path, result in zip(file_paths, results):
+                self.progress_callback(path, result.status)
+        
         return results
 
     def _extract_text(self, file_info: FileInfo) -> Optional[str]:
@@ -248,11 +262,22 @@ class ProcessingPipeline:
             
             # Handle PDFs
             if mime_type == 'application/pdf':
-                # Try native text extraction first
+                # The OCR processor uses the native text layer page by page and
+                # only runs OCR on scanned pages, so mixed PDFs keep all their text
+                if self.ocr_processor:
+                    try:
+                        text = self.ocr_processor.process_file(file_info.path)
+                        if text:
+                            logging.info(f"Successfully extracted text from PDF using text layer/OCR: {file_info.path}")
+                            return text
+                    except Exception as e:
+                        logging.error(f"OCR processing failed: {e}")
+                
+                # Try native text extraction
                 try:
                     import pdfplumber
                     with pdfplumber.open(file_info.path) as pdf:
-                        text = "\n".join(page.extract_text() for page in pdf.pages)
+                        text = "\n".join(page.extract_text() or '' for page in pdf.pages)
                         if text.strip():
                             logging.info(f"Successfully extracted text from PDF using pdfplumber: {file_info.path}")
                             return text
@@ -260,16 +285,7 @@ class ProcessingPipeline:
                 except Exception as e:
                     logging.warning(f"PDF text extraction failed: {e}")
 
-                # Try OCR if available and needed
-                if self.ocr_processor:
-                    try:
-                        text = self.ocr_processor.process_file(file_info.path)
-                        if text:
-                            logging.info(f"Successfully extracted text from PDF using OCR: {file_info.path}")
-                            return text
-                    except Exception as e:
-                        logging.error(f"OCR processing failed: {e}")
-                else:
+                if not self.ocr_processor:
                     logging.warning(
                         "OCR is not available. Some PDFs may not be processed correctly.\n"
                         "To enable OCR support:\n"
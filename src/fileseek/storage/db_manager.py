@@ -1,9 +1,12 @@
 import sqlite3
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 import json
 from datetime import datetime
 
+# SQLite's default limit on the number of host parameters per statement
+SQLITE_MAX_VARIABLES = 999
+
 class DBManager:
     def __init__(self, db_path: str = "~/.fileseek/fileseek.db"):
         """Initialize database connection and create tables if they don't exist."""
@@ -14,7 +17,9 @@ class DBManager:
 
     def _create_connection(self) -> sqlite3.Connection:
         """Create and return a database connection."""
-        conn = sqlite3.connect(self.db_path)
+        # Connections may be created on one thread and used on another (e.g.
+        # the watch event thread); callers never use one concurrently
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
         conn.row_factory = sqlite3.Row  # Enable row name access
         return conn
 
@@ -29,6 +34,7 @@ class DBManager:
                     file_hash TEXT NOT NULL,
                     mime_type TEXT,
                     metadata TEXT,
+                    mtime_ns INTEGER,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 );
@@ -50,18 +56,25 @@ class DBManager:
                     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 );
             """)
+            
+            # Add columns introduced after the initial schema
+            columns = {row['name'] for row in self.conn.execute("PRAGMA table_info(documents)")}
+            if 'mtime_ns' not in columns:
+                self.conn.execute("ALTER TABLE documents ADD COLUMN mtime_ns INTEGER")
 
     def add_document(self, path: str, file_hash: str, mime_type: str, 
-                    metadata: Optional[Dict] = None) -> int:
+                    metadata: Optional[Dict] = None,
+                    mtime_ns: Optional[int] = None) -> int:
         """Add a new document to the database."""
         with self.conn:
             cursor = self.conn.execute("""
-                INSERT INTO documents (path, filename, file_hash, mime_type, metadata)
-                VALUES (?, ?, ?, ?, ?)
+                INSERT INTO documents (path, filename, file_hash, mime_type, metadata, mtime_ns)
+                VALUES (?, ?, ?, ?, ?, ?)
                 ON CONFLICT(path) DO UPDATE SET
                     file_hash = excluded.file_hash,
                     mime_type = excluded.mime_type,
                     metadata = excluded.metadata,
+                    mtime_ns = excluded.mtime_ns,
                     updated_at = CURRENT_TIMESTAMP
                 RETURNING id
             """, (
@@ -69,10 +82,19 @@ class DBManager:
                 Path(path).name,
                 file_hash,
                 mime_type,
-                json.dumps(metadata) if metadata else None
+                json.dumps(metadata) if metadata else None,
+                mtime_ns
             ))
             return cursor.fetchone()[0]
 
+    def update_document_mtime(self, doc_id: int, mtime_ns: int):
+        """Record the modification time a document was last checked at."""
+        with self.conn:
+            self.conn.execute(
+                "UPDATE documents SET mtime_ns = ? WHERE id = ?",
+                (mtime_ns, doc_id)
+            )
+
     def get_document(self, doc_id: int) -> Optional[Dict]:
         """Retrieve a document by its ID."""
         cursor = self.conn.execute(
@@ -94,6 +116,41 @@ class DBManager:
             return dict(row)
         return None
 
+    def get_documents_by_paths(self, paths: Iterable[str]) -> Dict[str, Dict]:
+        """Retrieve documents for many paths, keyed by stored path."""
+        abs_paths = [str(Path(path).absolute()) for path in paths]
+        documents = {}
+        for i in range(0, len(abs_paths), SQLITE_MAX_VARIABLES):
+            batch = abs_paths[i:i + SQLITE_MAX_VARIABLES]
+            placeholders = ", ".join("?" for _ in batch)
+            cursor = self.conn.execute(
+                f"SELECT * FROM documents WHERE path IN ({placeholders})",
+                batch
+            )
+            for row in cursor.fetchall():
+                documents[row['path']] = dict(row)
+        return documents
+
+    def get_documents_by_path_prefixes(self, prefixes: Iterable[str]) -> List[Dict]:
+        """Retrieve documents whose path starts with any of the given prefixes."""
+        patterns = [self._escape_like(prefix) + "%" for prefix in prefixes]
+        documents = {}
+        for i in range(0, len(patterns), SQLITE_MAX_VARIABLES):
+            batch = patterns[i:i + SQLITE_MAX_VARIABLES]
+            conditions = " OR ".join("path LIKE ? ESCAPE '\\'" for _ in batch)
+            cursor = self.conn.execute(
+                f"SELECT * FROM documents WHERE {conditions}",
+                batch
+            )
+            for row in cursor.fetchall():
+                documents[row['id']] = dict(row)
+        return list(documents.values())
+
+    @staticmethod
+    def _escape_like(value: str) -> str:
+        """Escape LIKE wildcards in a literal value."""
+        return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
     def add_embedding(self, document_id: int, chunk_index: int, 
                      chunk_text: str, embedding_file: str) -> int:
         """Add an embedding for a document chunk."""
@@ -109,6 +166,22 @@ class DBManager:
             """, (document_id, chunk_index, chunk_text, embedding_file))
             return cursor.fetchone()[0]
 
+    def add_embeddings(self, document_id: int, chunk_texts: List[str],
+                       embedding_files: List[str]):
+        """Add embeddings for all chunks of a document in one transaction."""
+        with self.conn:
+            self.conn.executemany("""
+                INSERT INTO embeddings 
+                (document_id, chunk_index, chunk_text, embedding_file)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(document_id, chunk_index) DO UPDATE SET
+                    chunk_text = excluded.chunk_text,
+                    embedding_file = excluded.embedding_file
+            """, [
+                (document_id, i, chunk_text, embedding_file)
+                for i, (chunk_text, embedding_file) in enumerate(zip(chunk_texts, embedding_files))
+            ])
+
     def get_document_embeddings(self, document_id: int) -> List[Dict]:
         """Get all embeddings for a document."""
         cursor = self.conn.execute(
@@ -117,6 +190,32 @@ class DBManager:
         )
         return [dict(row) for row in cursor.fetchall()]
 
+    def get_chunk_counts(self, document_ids: Iterable[int]) -> Dict[int, int]:
+        """Get the number of stored chunks for each document."""
+        ids = list(document_ids)
+        counts = {}
+        for i in range(0, len(ids), SQLITE_MAX_VARIABLES):
+            batch = ids[i:i + SQLITE_MAX_VARIABLES]
+            placeholders = ", ".join("?" for _ in batch)
+            cursor = self.conn.execute(f"""
+                SELECT document_id, COUNT(*) FROM embeddings
+                WHERE document_id IN ({placeholders})
+                GROUP BY document_id
+            """, batch)
+            counts.update((row[0], row[1]) for row in cursor.fetchall())
+        return counts
+
+    def get_first_chunk(self, document_id: int) -> Optional[Dict]:
+        """Get the first chunk for a document."""
+        cursor = self.conn.execute(
+            "SELECT * FROM embeddings WHERE document_id = ? ORDER BY chunk_index LIMIT 1",
+            (document_id,)
+        )
+        row = cursor.fetchone()
+        if row:
+            return dict(row)
+        return None
+
     def set_config(self, key: str, value: str):
         """Set a configuration value."""
         with self.conn:
@@ -151,6 +250,45 @@ class DBManager:
         cursor = self.conn.execute("SELECT * FROM documents")
         return [dict(row) for row in cursor.fetchall()]
 
+    def list_documents(self, sort: str = 'date', reverse: bool = False,
+                       limit: Optional[int] = None) -> List[Dict]:
+        """List documents with chunk counts, sorted and limited in SQL.
+        
+        Dates and chunk counts sort newest/largest first, names sort
+        alphabetically; reverse flips the order.
+        """
+        sort_columns = {
+            'date': ('d.created_at', True),
+            'name': ('d.filename', False),
+            'chunks': ('chunk_count', True),
+        }
+        if sort not in sort_columns:
+            raise ValueError(f"Unknown sort key: {sort}")
+        column, descending = sort_columns[sort]
+        direction = "DESC" if descending != reverse else "ASC"
+        
+        query = f"""
+            SELECT d.*, COUNT(e.id) AS chunk_count
+            FROM documents d
+            LEFT JOIN embeddings e ON e.document_id = d.id
+            GROUP BY d.id
+            ORDER BY {column} {direction}, d.id {direction}
+        """
+        params = []
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        cursor = self.conn.execute(query, params)
+        return [dict(row) for row in cursor.fetchall()]
+
+    def get_totals(self) -> Tuple[int, int]:
+        """Get the total number of documents and chunks in the archive."""
+        row = self.conn.execute("""
+            SELECT (SELECT COUNT(*) FROM documents) AS document_count,
+                   (SELECT COUNT(*) FROM embeddings) AS chunk_count
+        """).fetchone()
+        return row['document_count'], row['chunk_count']
+
     def delete_document(self, document_id: int) -> bool:
         """Delete a document from the database."""
         with self.conn:
@@ -1,6 +1,5 @@
 from typing import List, Dict, Set, Optional, Callable, Union
 from pathlib import Path
-import time
 import logging
 from watchdog.observers import Observer
 from watchdog.events import (
@@ -9,13 +8,13 @@ from watchdog.events import (
     FileModifiedEvent,
     FileDeletedEvent
 )
-from threading import Lock, Event
+from threading import Lock, Event, Thread
 from queue import Queue
 import os
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 
-from fileseek.pipeline.file_detector import FileDetector
+from fileseek.pipeline.file_detector import FileDetector, PathPatternMatcher
 
 @dataclass
 class WatcherEvent:
@@ -34,6 +33,7 @@ class EventBuffer:
         self.lock = Lock()
         self.debounce_seconds = debounce_seconds
         self.last_processed = datetime.now()
+        self.has_events = Event()
 
     def add_event(self, event: WatcherEvent):
         """Add event to buffer."""
@@ -41,6 +41,12 @@ class EventBuffer:
             existing = self.events.get(event.path)
             if not existing or existing.timestamp < event.timestamp:
                 self.events[event.path] = event
+            self.has_events.set()
+
+    def time_until_ready(self) -> float:
+        """Seconds left until the debounce window has passed."""
+        elapsed = (datetime.now() - self.last_processed).total_seconds()
+        return max(0.0, self.debounce_seconds - elapsed)
 
     def get_events(self) -> List[WatcherEvent]:
         """Get and clear buffered events."""
@@ -51,6 +57,7 @@ class EventBuffer:
         with self.lock:
             events = list(self.events.values())
             self.events.clear()
+            self.has_events.clear()
             self.last_processed = now
             return events
 
@@ -70,11 +77,15 @@ class FileWatcher(FileSystemEventHandler):
         self.ignore_patterns = ignore_patterns or []
         self.ignore_directories = ignore_directories
         self.case_sensitive = case_sensitive
+        self._include_matcher = PathPatternMatcher(patterns)
+        self._ignore_matcher = PathPatternMatcher(self.ignore_patterns)
         
         self.observer = Observer()
         self.watch_paths: Set[Path] = set()
         self.event_buffer = EventBuffer()
         self.running = Event()
+        self._stop_requested = Event()
+        self._processing_thread: Optional[Thread] = None
         self.processing_queue: Queue = Queue()
         self.file_detector = FileDetector()
 
@@ -84,18 +95,30 @@ class FileWatcher(FileSystemEventHandler):
             raise ValueError("No paths to watch")
             
         self.running.set()
+        self._stop_requested.clear()
         self.observer.start()
         
-        # Start event processing
-        self._process_events()
+        # Start event processing in the background
+        self._processing_thread = Thread(
+            target=self._process_events,
+            name="FileWatcherEvents",
+            daemon=True
+        )
+        self._processing_thread.start()
         
         logging.info("File watcher started")
 
     def stop(self):
         """Stop watching."""
         self.running.clear()
+        self._stop_requested.set()
+        # Wake the processing thread if it is waiting for events
+        self.event_buffer.has_events.set()
         self.observer.stop()
         self.observer.join()
+        if self._processing_thread:
+            self._processing_thread.join()
+            self._processing_thread = None
         logging.info("File watcher stopped")
 
     def add_watch(self, path: Union[str, Path], recursive: bool = True):
@@ -125,29 +148,32 @@ class FileWatcher(FileSystemEventHandler):
     def _should_process_path(self, path: Path) -> bool:
         """Check if path should be processed."""
         # Check if path matches patterns
-        if self.patterns:
-            matched = any(path.match(pattern) for pattern in self.patterns)
-            if not matched:
-                return False
+        if self._include_matcher and not self._include_matcher.match(path):
+            return False
                 
         # Check if path matches ignore patterns
-        if self.ignore_patterns:
-            ignored = any(path.match(pattern) for pattern in self.ignore_patterns)
-            if ignored:
-                return False
+        if self._ignore_matcher.match(path):
+            return False
                 
         return True
 
     def _process_events(self):
         """Process buffered events."""
         while self.running.is_set():
+            # Block until events arrive instead of polling
+            self.event_buffer.has_events.wait()
+            
+            # Let the debounce window pass, waking early on stop()
+            self._stop_requested.wait(self.event_buffer.time_until_ready())
+            if not self.running.is_set():
+                break
+                
             events = self.event_buffer.get_events()
             for event in events:
                 try:
                     self.callback(event)
                 except Exception as e:
                     logging.error(f"Error processing event: {e}")
-            time.sleep(0.1)
 
     def on_created(self, event: FileCreatedEvent):
         """Handle file creation event."""
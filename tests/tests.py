@@ -0,0 +1,226 @@
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path, PurePath
+from unittest import mock
+
+import click
+
+from fileseek.cli import cli as cli_module
+from fileseek.core.archivist import Archivist
+from fileseek.pipeline.file_detector import PathPatternMatcher
+from fileseek.storage.db_manager import DBManager, SQLITE_MAX_VARIABLES
+
+
+class DBManagerTestCase(unittest.TestCase):
+    """Base case providing a DBManager on a temporary database."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.temp_dir.name) / "fileseek.db"
+        self.db = DBManager(str(self.db_path))
+
+    def tearDown(self):
+        self.db.close()
+        self.temp_dir.cleanup()
+
+
+class TestSchemaMigration(unittest.TestCase):
+
+    def test_adds_mtime_column_to_existing_database(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = Path(temp_dir) / "fileseek.db"
+            conn = sqlite3.connect(db_path)
+            conn.executescript("""
+                CREATE TABLE documents (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    path TEXT UNIQUE NOT NULL,
+                    filename TEXT NOT NULL,
+                    file_hash TEXT NOT NULL,
+                    mime_type TEXT,
+                    metadata TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+                INSERT INTO documents (path, filename, file_hash) VALUES ('/docs/a.txt', 'a.txt', 'hash');
+            """)
+            conn.close()
+
+            db = DBManager(str(db_path))
+            try:
+                doc = db.get_document_by_path('/docs/a.txt')
+                self.assertEqual(doc['file_hash'], 'hash')
+                self.assertIsNone(doc['mtime_ns'])
+
+                db.update_document_mtime(doc['id'], 123)
+                self.assertEqual(db.get_document(doc['id'])['mtime_ns'], 123)
+            finally:
+                db.close()
+
+            # Reopening an already migrated database is a no-op
+            DBManager(str(db_path)).close()
+
+
+class TestDocumentLookups(DBManagerTestCase):
+
+    def test_path_prefixes_treat_like_wildcards_literally(self):
+        for path in ['/data/a_b/x.txt', '/data/axb/y.txt', '/data/100%/z.txt', '/data/100x/w.txt']:
+            self.db.add_document(path, 'hash', 'text/plain')
+
+        docs = self.db.get_documents_by_path_prefixes(['/data/a_b/'])
+        self.assertEqual([doc['path'] for doc in docs], ['/data/a_b/x.txt'])
+
+        docs = self.db.get_documents_by_path_prefixes(['/data/100%/'])
+        self.assertEqual([doc['path'] for doc in docs], ['/data/100%/z.txt'])
+
+    def test_path_prefixes_return_each_document_once(self):
+        self.db.add_document('/data/sub/x.txt', 'hash', 'text/plain')
+        docs = self.db.get_documents_by_path_prefixes(['/data/', '/data/sub/'])
+        self.assertEqual(len(docs), 1)
+
+    def test_lookups_beyond_parameter_limit(self):
+        count = SQLITE_MAX_VARIABLES * 2 + 1
+        paths = [f'/data/{i}.txt' for i in range(count)]
+        doc_ids = [self.db.add_document(path, 'hash', 'text/plain') for path in paths]
+        for doc_id in doc_ids[::2]:
+            self.db.add_embeddings(doc_id, ['first', 'second'], [f'{doc_id}_0', f'{doc_id}_1'])
+
+        docs = self.db.get_documents_by_paths(paths)
+        self.assertEqual(set(docs), set(paths))
+
+        counts = self.db.get_chunk_counts(doc_ids)
+        self.assertEqual(counts, {doc_id: 2 for doc_id in doc_ids[::2]})
+
+
+class TestListDocuments(DBManagerTestCase):
+
+    def setUp(self):
+        super().setUp()
+        for name, chunk_count in [('b.txt', 1), ('a.txt', 3), ('c.txt', 2)]:
+            doc_id = self.db.add_document(f'/data/{name}', 'hash', 'text/plain')
+            chunks = [f'chunk {i}' for i in range(chunk_count)]
+            self.db.add_embeddings(doc_id, chunks, [f'{doc_id}_{i}' for i in range(chunk_count)])
+
+    def names(self, docs):
+        return [doc['filename'] for doc in docs]
+
+    def test_sort_by_name(self):
+        self.assertEqual(self.names(self.db.list_documents('name')), ['a.txt', 'b.txt', 'c.txt'])
+        self.assertEqual(self.names(self.db.list_documents('name', reverse=True)), ['c.txt', 'b.txt', 'a.txt'])
+
+    def test_sort_by_chunks(self):
+        docs = self.db.list_documents('chunks')
+        self.assertEqual(self.names(docs), ['a.txt', 'c.txt', 'b.txt'])
+        self.assertEqual([doc['chunk_count'] for doc in docs], [3, 2, 1])
+        self.assertEqual(self.names(self.db.list_documents('chunks', reverse=True)), ['b.txt', 'c.txt', 'a.txt'])
+
+    def test_sort_by_date_is_newest_first(self):
+        # Same-second timestamps fall back to id order in the same direction
+        self.assertEqual(self.names(self.db.list_documents('date')), ['c.txt', 'a.txt', 'b.txt'])
+        self.assertEqual(self.names(self.db.list_documents('date', reverse=True)), ['b.txt', 'a.txt', 'c.txt'])
+
+    def test_limit_and_totals(self):
+        self.assertEqual(self.names(self.db.list_documents('name', limit=2)), ['a.txt', 'b.txt'])
+        self.assertEqual(self.db.get_totals(), (3, 6))
+
+    def test_unknown_sort_key(self):
+        with self.assertRaises(ValueError):
+            self.db.list_documents('size')
+
+
+class TestPathPatternMatcher(unittest.TestCase):
+
+    PATTERNS = [
+        '*.tmp', '.*', '*~', '~$*', 'a?c', '[ab]*.py', '*',
+        'build/*', '*/node_modules/*', 'src/*/x.txt', '/abs/*.txt', '/*',
+    ]
+    PATHS = [
+        'x/y.tmp', 'y.tmp', '.hidden', 'dir/.hidden/file', 'notes.txt~',
+        '/home/user/~$doc.docx', 'abc', 'a/c', 'abbc', 'b.py', 'dir/a_test.py', 'c.py',
+        'build/out.o', 'src/build/out.o', 'build/sub/out.o',
+        'p/node_modules/q', 'node_modules/q', 'src/lib/x.txt', 'src/x.txt',
+        '/abs/f.txt', '/other/abs/f.txt', 'abs/f.txt', '/f', '/abs',
+    ]
+
+    def test_single_patterns_match_like_purepath(self):
+        for pattern in self.PATTERNS:
+            matcher = PathPatternMatcher([pattern])
+            for path in self.PATHS:
+                with self.subTest(pattern=pattern, path=path):
+                    self.assertEqual(matcher.match(path), PurePath(path).match(pattern))
+
+    def test_combined_patterns_match_any(self):
+        patterns = [pattern for pattern in self.PATTERNS if pattern != '*']
+        matcher = PathPatternMatcher(patterns)
+        for path in self.PATHS:
+            with self.subTest(path=path):
+                expected = any(PurePath(path).match(pattern) for pattern in patterns)
+                self.assertEqual(matcher.match(path), expected)
+
+    def test_empty_matcher(self):
+        matcher = PathPatternMatcher([])
+        self.assertFalse(matcher)
+        self.assertFalse(matcher.match('anything.txt'))
+        self.assertTrue(PathPatternMatcher(['*.txt']))
+
+
+class TestProcessCommand(DBManagerTestCase):
+    """Change detection in `fileseek process`, against a real database."""
+
+    def setUp(self):
+        super().setUp()
+        self.docs_dir = Path(self.temp_dir.name) / "docs"
+        self.docs_dir.mkdir()
+        self.kept = self.add_file('kept.txt')
+        self.modified = self.add_file('modified.txt', stale=True)
+        self.new = self.docs_dir / 'new.txt'
+        self.new.write_text('new')
+        self.deleted = self.docs_dir / 'deleted.txt'
+        self.db.add_document(str(self.deleted), 'hash', 'text/plain', mtime_ns=1)
+
+        # Only the database is real; ingestion and removal are recorded
+        self.archivist = Archivist.__new__(Archivist)
+        self.archivist.db_manager = self.db
+        self.archivist.ingest_files = mock.Mock(return_value={})
+        self.archivist.remove_document = mock.Mock(return_value=True)
+
+    def add_file(self, name, stale=False):
+        """Create an ingested file, recorded with an older mtime if stale."""
+        path = self.docs_dir / name
+        path.write_text(name)
+        mtime_ns = path.stat().st_mtime_ns - (1 if stale else 0)
+        self.db.add_document(str(path), 'hash', 'text/plain', mtime_ns=mtime_ns)
+        return path
+
+    def run_process(self, *paths):
+        with mock.patch.object(cli_module, 'Archivist', return_value=self.archivist):
+            cli_instance = cli_module.FileSeekCLI()
+            ctx = click.Context(cli_module.process, obj=cli_instance)
+            ctx.invoke(cli_module.process, paths=[str(path) for path in paths], recursive=False, dry_run=False)
+
+    def ingested(self):
+        if not self.archivist.ingest_files.called:
+            return set()
+        return set(self.archivist.ingest_files.call_args.args[0])
+
+    def removed(self):
+        return {Path(call.args[0]) for call in self.archivist.remove_document.call_args_list}
+
+    def test_directory_processes_changes_and_removes_deleted_files(self):
+        self.run_process(self.docs_dir)
+        self.assertEqual(self.ingested(), {self.modified, self.new})
+        self.assertEqual(self.removed(), {self.deleted})
+
+    def test_single_file_does_not_remove_siblings(self):
+        self.run_process(self.modified)
+        self.assertEqual(self.ingested(), {self.modified})
+        self.assertEqual(self.removed(), set())
+
+    def test_unchanged_single_file_is_skipped(self):
+        self.run_process(self.kept)
+        self.assertEqual(self.ingested(), set())
+        self.assertEqual(self.removed(), set())
+
+
+if __name__ == '__main__':
+    unittest.main()